@@ -3,8 +3,9 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers import selector
 
-from .const import DOMAIN
-from .sensor import (
+from .const import (
+    DOMAIN,
+    CONF_SOURCE_ENTITY,
     CONF_SETPOINT,
     CONF_THRESHOLD,
     CONF_MIN_AMPLITUDE,
@@ -13,6 +14,21 @@ from .sensor import (
     DEFAULT_MIN_AMPLITUDE,
 )
 
+# Defaults are static, so the schema is compiled once at import time
+DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_SOURCE_ENTITY): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain=["sensor"],
+                multiple=False,
+            ),
+        ),
+        vol.Optional(CONF_SETPOINT, default=DEFAULT_SETPOINT): vol.Coerce(float),
+        vol.Optional(CONF_THRESHOLD, default=DEFAULT_THRESHOLD): vol.Coerce(float),
+        vol.Optional(CONF_MIN_AMPLITUDE, default=DEFAULT_MIN_AMPLITUDE): vol.Coerce(float),
+    }
+)
+
 class PHControlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for pH Control."""
 
@@ -24,25 +40,13 @@ class PHControlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         
         if user_input is not None:
             return self.async_create_entry(
-                title=f"pH Control for {user_input['source_entity']}", 
+                title=f"pH Control for {user_input[CONF_SOURCE_ENTITY]}", 
                 data=user_input
             )
 
         # Show form with configuration options
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema(
-                {
-                    vol.Required("source_entity"): selector.EntitySelector(
-                        selector.EntitySelectorConfig(
-                            domain=["sensor"],
-                            multiple=False,
-                        ),
-                    ),
-                    vol.Optional(CONF_SETPOINT, default=DEFAULT_SETPOINT): vol.Coerce(float),
-                    vol.Optional(CONF_THRESHOLD, default=DEFAULT_THRESHOLD): vol.Coerce(float),
-                    vol.Optional(CONF_MIN_AMPLITUDE, default=DEFAULT_MIN_AMPLITUDE): vol.Coerce(float),
-                }
-            ),
+            data_schema=DATA_SCHEMA,
             errors=errors,
         )
@@ -2,6 +2,15 @@
 
 DOMAIN = "ph_control"
 
+CONF_SOURCE_ENTITY = "source_entity"
+CONF_SETPOINT = "setpoint"
+CONF_THRESHOLD = "threshold"
+CONF_MIN_AMPLITUDE = "min_amplitude"
+
+DEFAULT_SETPOINT = 7.8  # Midpoint of typical pH oscillation
+DEFAULT_THRESHOLD = 0.3 # How much deviation is significant
+DEFAULT_MIN_AMPLITUDE = 0.1 # Minimum change to consider
+
 # Required attributes for amplitude and oscillation calculations
 ATTR_PEAKS = "peaks"
 ATTR_TROUGHS = "troughs"
@@ -1,246 +1,321 @@
 """Support for pH Control sensors."""
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from typing import Callable, Optional
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant, callback, split_entity_id
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
 
-from .const import DOMAIN, ATTR_PEAKS, ATTR_TROUGHS, ATTR_AMPLITUDE, ATTR_OSCILLATIONS
+from .const import (
+    DOMAIN,
+    ATTR_PEAKS,
+    ATTR_TROUGHS,
+    ATTR_AMPLITUDE,
+    ATTR_OSCILLATIONS,
+    CONF_SOURCE_ENTITY,
+    CONF_SETPOINT,
+    CONF_THRESHOLD,
+    CONF_MIN_AMPLITUDE,
+    DEFAULT_SETPOINT,
+    DEFAULT_THRESHOLD,
+    DEFAULT_MIN_AMPLITUDE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-CONF_SETPOINT = "setpoint"
-CONF_THRESHOLD = "threshold"
-CONF_MIN_AMPLITUDE = "min_amplitude"
+# Source states that carry no reading and are skipped without parsing
+_INVALID_STATES = frozenset((STATE_UNAVAILABLE, STATE_UNKNOWN))
 
-DEFAULT_SETPOINT = 7.8  # Midpoint of typical pH oscillation
-DEFAULT_THRESHOLD = 0.3 # How much deviation is significant
-DEFAULT_MIN_AMPLITUDE = 0.1 # Minimum change to consider
+# Number of recent peaks and troughs kept for the amplitude calculation
+_MAX_EXTREMA = 200
+
+# Attribute names for the processor's integer trend direction
+_TREND_NAMES = {1: "up", -1: "down", 0: None}
+
+# Number of recent peaks and troughs exposed as attributes
+_RECENT_EXTREMA = 10
+
+# Probes repeat a small set of low-precision strings, so recent parses are reused
+_PARSE_CACHE_SIZE = 64
+_parse_cache: dict[str, float] = {}
+
+# Seconds to coalesce oscillation sensor state writes over
+_WRITE_DEBOUNCE = 0.1
+
+def _parse_ph(raw_state: str) -> float:
+    """Parse a pH state string, reusing recently parsed values."""
+    value = _parse_cache.get(raw_state)
+    if value is None:
+        value = float(raw_state)
+        if len(_parse_cache) >= _PARSE_CACHE_SIZE:
+            # Dicts keep insertion order, so this evicts the oldest entry
+            del _parse_cache[next(iter(_parse_cache))]
+        _parse_cache[raw_state] = value
+    return value
+
+def _recent(values: deque) -> list:
+    """Return the most recent extrema for the state attributes."""
+    return list(islice(values, max(len(values) - _RECENT_EXTREMA, 0), None))
+
+class PHStreamProcessor:
+    """Detect pH trend reversals once and feed them to the sensors."""
+
+    def __init__(self, source_entity: str, setpoint: float, threshold: float,
+                 min_amplitude: float) -> None:
+        """Initialize the stream processor."""
+        self._source_entity = source_entity
+        self._min_amplitude = min_amplitude
+        # Readings outside these bounds deviate significantly from the setpoint
+        self._upper_bound = setpoint + threshold
+        self._lower_bound = setpoint - threshold
+        self._listeners = []
+
+        self._last_value = None
+        self._trend = 0
+        self._parse_error_logged = False
+
+    @callback
+    def async_add_listener(self, update_callback: Callable) -> Callable:
+        """Register a sensor update callback and return its remover."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_handle_state_change(self, event) -> None:
+        """Parse the source state once and fan it out to the sensors."""
+        # state_changed events always carry new_state; it is None on removal
+        new_state = event.data["new_state"]
+        if new_state is None:
+            return
+
+        raw_state = new_state.state
+        if raw_state in _INVALID_STATES:
+            return
+
+        try:
+            current_value = _parse_ph(raw_state)
+        except (ValueError, TypeError):
+            # Report a non-numeric source once rather than on every update
+            if not self._parse_error_logged:
+                _LOGGER.warning(
+                    "Unable to process pH value from %s: %s",
+                    self._source_entity, raw_state
+                )
+                self._parse_error_logged = True
+            return
+        self._parse_error_logged = False
+
+        self._process(current_value)
+
+    def _process(self, current_value: float) -> None:
+        """Track the trend of a new reading and notify the sensors."""
+        if self._last_value is None:
+            self._last_value = current_value
+            return
+
+        # Check if the change is significant (exceeds min amplitude)
+        value_change = abs(current_value - self._last_value)
+        if value_change < self._min_amplitude:
+            # Ignore small fluctuations
+            self._last_value = current_value
+            return
+
+        # Determine if we've moved significantly from the setpoint
+        significant_change = (
+            current_value > self._upper_bound
+            or current_value < self._lower_bound
+        )
+
+        peak = None
+        trough = None
+        # 1 when rising, -1 when falling, 0 when unchanged
+        direction = (
+            (current_value > self._last_value) - (current_value < self._last_value)
+        )
+
+        # Detect peaks and troughs based on trend changes
+        if not self._trend:
+            # Initialize trend direction
+            self._trend = direction
+        elif direction and direction != self._trend and significant_change:
+            # Significant trend reversal, the previous reading was the extreme
+            if self._trend > 0:
+                peak = self._last_value
+            else:
+                trough = self._last_value
+            self._trend = direction
+
+        trend = _TREND_NAMES[self._trend]
+        # Advance first so a failing sensor cannot desync the trend
+        self._last_value = current_value
+        for update in self._listeners:
+            update(trend, peak, trough)
 
 class PHAmplitudeSensor(SensorEntity):
     """Representation of a pH Amplitude Sensor."""
 
-    def __init__(self, hass: HomeAssistant, entry_id: str, source_entity: str, 
-                 setpoint: float, threshold: float, min_amplitude: float) -> None:
+    _attr_should_poll = False
+
+    def __init__(self, processor: PHStreamProcessor, entry_id: str,
+                 source_entity: str, setpoint: float, threshold: float,
+                 min_amplitude: float) -> None:
         """Initialize the amplitude sensor."""
-        self.hass = hass
-        self._entry_id = entry_id
-        self._source_entity = source_entity
-        self._setpoint = setpoint
-        self._threshold = threshold
-        self._min_amplitude = min_amplitude
-        
-        self._attr_name = f"pH Amplitude {source_entity.split('.')[1]}"
+        self._processor = processor
+        self._attr_name = f"pH Amplitude {split_entity_id(source_entity)[1]}"
         self._attr_unique_id = f"{entry_id}_amplitude"
         self._attr_native_unit_of_measurement = ""
         self._attr_state_class = "measurement"
         
-        self._amplitude = None
-        self._peaks = []
-        self._troughs = []
-        self._last_value = None
+        self._attr_native_value = None
+        self._peaks = deque(maxlen=_MAX_EXTREMA)
+        self._troughs = deque(maxlen=_MAX_EXTREMA)
+        # Running extremes so the amplitude doesn't rescan the history
+        self._peak_max = None
+        self._trough_min = None
         self._trend = None
-        self._significant_change = False
-        self._last_direction_change_time = None
-        self._unsub_listener = None
+        # Updated in place when state changes; HA copies it on each write
+        self._attr_extra_state_attributes = {
+            ATTR_PEAKS: [],
+            ATTR_TROUGHS: [],
+            "last_updated": None,
+            "trend": None,
+            "setpoint": setpoint,
+            "threshold": threshold,
+            "min_amplitude": min_amplitude,
+        }
+
+    def _record_peak(self, value: float) -> None:
+        """Store a peak and keep the running maximum current."""
+        evicted = self._peaks[0] if len(self._peaks) == _MAX_EXTREMA else None
+        self._peaks.append(value)
+        if evicted is not None and evicted == self._peak_max:
+            # The maximum fell out of the window, rescan once
+            self._peak_max = max(self._peaks)
+        elif self._peak_max is None or value > self._peak_max:
+            self._peak_max = value
+
+    def _record_trough(self, value: float) -> None:
+        """Store a trough and keep the running minimum current."""
+        evicted = self._troughs[0] if len(self._troughs) == _MAX_EXTREMA else None
+        self._troughs.append(value)
+        if evicted is not None and evicted == self._trough_min:
+            # The minimum fell out of the window, rescan once
+            self._trough_min = min(self._troughs)
+        elif self._trough_min is None or value < self._trough_min:
+            self._trough_min = value
 
     async def async_added_to_hass(self) -> None:
-        """Set up state change listener when added to hass."""
-        @callback
-        def process_state_change(event):
-            """Handle state changes."""
-            new_state = event.data.get("new_state")
-            if new_state is None:
-                return
-
-            try:
-                current_value = float(new_state.state)
-                current_time = datetime.now()
-                
-                if self._last_value is None:
-                    self._last_value = current_value
-                    return
-
-                # Check if the change is significant (exceeds min amplitude)
-                value_change = abs(current_value - self._last_value)
-                if value_change < self._min_amplitude:
-                    # Ignore small fluctuations
-                    self._last_value = current_value
-                    return
-                
-                # Determine if we've moved significantly from the setpoint
-                deviation_from_setpoint = abs(current_value - self._setpoint)
-                self._significant_change = deviation_from_setpoint > self._threshold
-                
-                # Detect peaks and troughs based on trend changes
-                if self._trend is None:
-                    # Initialize trend direction
-                    if current_value > self._last_value:
-                        self._trend = "up"
-                    elif current_value < self._last_value:
-                        self._trend = "down"
-                else:
-                    # Detect significant trend reversals
-                    if self._trend == "up" and current_value < self._last_value:
-                        # Peak detected - only register if significant
-                        if self._significant_change:
-                            self._peaks.append(self._last_value)
-                            self._trend = "down"
-                            self._last_direction_change_time = current_time
-                    elif self._trend == "down" and current_value > self._last_value:
-                        # Trough detected - only register if significant
-                        if self._significant_change:
-                            self._troughs.append(self._last_value)
-                            self._trend = "up"
-                            self._last_direction_change_time = current_time
-
-                # Calculate amplitude if we have both peaks and troughs
-                if self._peaks and self._troughs:
-                    self._amplitude = max(self._peaks) - min(self._troughs)
-                    self.async_write_ha_state()
-
-                self._last_value = current_value
-            except (ValueError, TypeError):
-                _LOGGER.error("Unable to process pH value: %s", new_state.state)
-
-        self._unsub_listener = async_track_state_change_event(
-            self.hass, [self._source_entity], process_state_change
-        )
+        """Register with the processor once the sensor is added."""
+        self.async_on_remove(self._processor.async_add_listener(self._update))
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Clean up when entity is removed."""
-        if self._unsub_listener is not None:
-            self._unsub_listener()
-
-    @property
-    def native_value(self):
-        """Return the current amplitude."""
-        return self._amplitude
-
-    @property
-    def extra_state_attributes(self):
-        """Return additional attributes."""
-        return {
-            ATTR_PEAKS: self._peaks[-10:] if self._peaks else [],
-            ATTR_TROUGHS: self._troughs[-10:] if self._troughs else [],
-            "last_updated": datetime.now().isoformat(),
-            "trend": self._trend,
-            "setpoint": self._setpoint,
-            "threshold": self._threshold,
-            "min_amplitude": self._min_amplitude
-        }
+    @callback
+    def _update(self, trend: Optional[str], peak: Optional[float],
+                trough: Optional[float]) -> None:
+        """Apply a processed reading from the stream processor."""
+        # The amplitude only moves when a peak or trough is recorded
+        if peak is None and trough is None and trend == self._trend:
+            return
+
+        attributes = self._attr_extra_state_attributes
+        self._trend = trend
+        attributes["trend"] = trend
+        if peak is not None:
+            self._record_peak(peak)
+            attributes[ATTR_PEAKS] = _recent(self._peaks)
+        if trough is not None:
+            self._record_trough(trough)
+            attributes[ATTR_TROUGHS] = _recent(self._troughs)
+
+        # Calculate amplitude if we have both peaks and troughs
+        if self._peaks and self._troughs:
+            self._attr_native_value = self._peak_max - self._trough_min
+            attributes["last_updated"] = datetime.now().isoformat()
+            self.async_write_ha_state()
 
 class PHOscillationSensor(SensorEntity):
     """Representation of the pH Oscillation Count Sensor."""
 
-    def __init__(self, hass: HomeAssistant, entry_id: str, source_entity: str,
-                 setpoint: float, threshold: float, min_amplitude: float) -> None:
+    _attr_should_poll = False
+
+    def __init__(self, processor: PHStreamProcessor, entry_id: str,
+                 source_entity: str, setpoint: float, threshold: float,
+                 min_amplitude: float) -> None:
         """Initialize the oscillation sensor."""
-        self.hass = hass
-        self._entry_id = entry_id
-        self._source_entity = source_entity
-        self._setpoint = setpoint
-        self._threshold = threshold
-        self._min_amplitude = min_amplitude
-        
-        self._attr_name = f"pH Oscillations {source_entity.split('.')[1]}"
+        self._processor = processor
+        self._attr_name = f"pH Oscillations {split_entity_id(source_entity)[1]}"
         self._attr_unique_id = f"{entry_id}_oscillations"
         self._attr_native_unit_of_measurement = "cycles"
         self._attr_state_class = "measurement"
         
-        self._oscillations = 0
+        self._attr_native_value = 0
         self._direction_changes = 0
-        self._last_value = None
         self._trend = None
-        self._significant_change = False
-        self._last_direction_change_time = None
-        self._unsub_listener = None
+        # Updated in place when state changes; HA copies it on each write
+        self._attr_extra_state_attributes = {
+            "direction_changes": 0,
+            "last_updated": None,
+            "trend": None,
+            "setpoint": setpoint,
+            "threshold": threshold,
+            "min_amplitude": min_amplitude,
+        }
+        self._cancel_flush = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending state write when the entity is removed."""
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
 
     async def async_added_to_hass(self) -> None:
-        """Set up state change listener when added to hass."""
-        @callback
-        def process_state_change(event):
-            """Handle state changes."""
-            new_state = event.data.get("new_state")
-            if new_state is None:
-                return
-
-            try:
-                current_value = float(new_state.state)
-                current_time = datetime.now()
-                
-                if self._last_value is None:
-                    self._last_value = current_value
-                    return
-
-                # Check if the change is significant (exceeds min amplitude)
-                value_change = abs(current_value - self._last_value)
-                if value_change < self._min_amplitude:
-                    # Ignore small fluctuations
-                    self._last_value = current_value
-                    return
-                
-                # Determine if we've moved significantly from the setpoint
-                deviation_from_setpoint = abs(current_value - self._setpoint)
-                self._significant_change = deviation_from_setpoint > self._threshold
-                
-                # Detect trend changes
-                if self._trend is None:
-                    # Initialize trend direction
-                    if current_value > self._last_value:
-                        self._trend = "up"
-                    elif current_value < self._last_value:
-                        self._trend = "down"
-                else:
-                    # Detect significant trend reversals
-                    if self._trend == "up" and current_value < self._last_value:
-                        if self._significant_change:
-                            self._direction_changes += 1
-                            self._trend = "down"
-                            self._last_direction_change_time = current_time
-                    elif self._trend == "down" and current_value > self._last_value:
-                        if self._significant_change:
-                            self._direction_changes += 1
-                            self._trend = "up"
-                            self._last_direction_change_time = current_time
-                
-                # Each complete oscillation has two direction changes
-                self._oscillations = self._direction_changes // 2
-                self.async_write_ha_state()
-                
-                self._last_value = current_value
-            except (ValueError, TypeError):
-                _LOGGER.error("Unable to process pH value: %s", new_state.state)
-
-        self._unsub_listener = async_track_state_change_event(
-            self.hass, [self._source_entity], process_state_change
-        )
+        """Register with the processor once the sensor is added."""
+        self.async_on_remove(self._processor.async_add_listener(self._update))
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Clean up when entity is removed."""
-        if self._unsub_listener is not None:
-            self._unsub_listener()
-
-    @property
-    def native_value(self):
-        """Return the current oscillation count."""
-        return self._oscillations
-
-    @property
-    def extra_state_attributes(self):
-        """Return additional attributes."""
-        return {
-            "direction_changes": self._direction_changes,
-            "last_updated": datetime.now().isoformat(),
-            "trend": self._trend,
-            "setpoint": self._setpoint,
-            "threshold": self._threshold,
-            "min_amplitude": self._min_amplitude
-        }
+    @callback
+    def _update(self, trend: Optional[str], peak: Optional[float],
+                trough: Optional[float]) -> None:
+        """Apply a processed reading from the stream processor."""
+        reversed_direction = peak is not None or trough is not None
+
+        # Only write state when the count or the reported trend changed
+        if not reversed_direction and trend == self._trend:
+            return
+
+        self._trend = trend
+        if reversed_direction:
+            self._direction_changes += 1
+            # Each complete oscillation has two direction changes
+            self._attr_native_value = self._direction_changes // 2
+
+        # Coalesce bursts of changes into a single state write
+        if self._cancel_flush is None:
+            self._cancel_flush = async_call_later(
+                self.hass, _WRITE_DEBOUNCE, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self, _now: datetime) -> None:
+        """Write the latest oscillation state."""
+        self._cancel_flush = None
+        attributes = self._attr_extra_state_attributes
+        attributes["direction_changes"] = self._direction_changes
+        attributes["trend"] = self._trend
+        attributes["last_updated"] = datetime.now().isoformat()
+        self.async_write_ha_state()
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -249,7 +324,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up pH Control sensors from a config entry."""
     config = config_entry.data
-    source_entity = config.get("source_entity")
+    source_entity = config.get(CONF_SOURCE_ENTITY)
     entry_id = config_entry.entry_id
     
     # Get the configurable parameters with defaults
@@ -257,12 +332,24 @@ async def async_setup_entry(
     threshold = config.get(CONF_THRESHOLD, DEFAULT_THRESHOLD)
     min_amplitude = config.get(CONF_MIN_AMPLITUDE, DEFAULT_MIN_AMPLITUDE)
 
+    # A single processor and listener serve both sensors
+    processor = PHStreamProcessor(
+        source_entity, setpoint, threshold, min_amplitude
+    )
+
     # Create amplitude and oscillation sensors
     amplitude_sensor = PHAmplitudeSensor(
-        hass, entry_id, source_entity, setpoint, threshold, min_amplitude
+        processor, entry_id, source_entity, setpoint, threshold, min_amplitude
     )
     oscillation_sensor = PHOscillationSensor(
-        hass, entry_id, source_entity, setpoint, threshold, min_amplitude
+        processor, entry_id, source_entity, setpoint, threshold, min_amplitude
+    )
+    entities = [amplitude_sensor, oscillation_sensor]
+
+    config_entry.async_on_unload(
+        async_track_state_change_event(
+            hass, [source_entity], processor.async_handle_state_change
+        )
     )
 
-    async_add_entities([amplitude_sensor, oscillation_sensor], True)
+    async_add_entities(entities)